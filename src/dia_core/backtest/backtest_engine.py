@@ -14,9 +14,12 @@ Auteur : DYXIUM Invest / D.I.A. Core
 from dataclasses import dataclass
 from typing import Final, Literal
 
+import numpy as np
 import pandas as pd
+from numpy.typing import NDArray
 
 from src.dia_core.strategy.decision_policy import DecisionPolicy, TradeDecision
+from src.dia_core.providers.regime import compute_regime_arrays
 from src.dia_core.risk.risk_manager import RiskManager
 from src.dia_core.tracking.trade_logger import TradeLogger, TradeLogEntry
 
@@ -74,17 +77,12 @@ class BacktestEngine:
     # ---------------- helpers ----------------
 
     @staticmethod
-    def _compute_regime(window: pd.DataFrame) -> Regime:
-        """Calcule le vecteur de régime à partir de la fenêtre courante."""
-        mom = (window["close"].iloc[-1] - window["close"].iloc[-5]) / window["close"].iloc[-5]
-        vol = window["close"].pct_change().rolling(5).std().iloc[-1]
-        trd = float(window["close"].rolling(10).mean().iloc[-1] - window["close"].mean())
-        return Regime(momentum=float(mom), volatility=float(vol), trend=trd)
-
-    @staticmethod
-    def _last_price(window: pd.DataFrame) -> float:
-        """Renvoie le dernier prix de clôture de la fenêtre."""
-        return float(window["close"].iloc[-1])
+    def _compute_regime(close: NDArray[np.float64]) -> Regime:
+        """Calcule le vecteur de régime à partir des clôtures de la fenêtre courante."""
+        values = compute_regime_arrays(close)
+        return Regime(
+            momentum=values["momentum"], volatility=values["volatility"], trend=values["trend"]
+        )
 
     @staticmethod
     def _signed_size(raw_size: float, decision: Decision) -> float:
@@ -122,9 +120,11 @@ class BacktestEngine:
     def run(self) -> None:
         """Rejoue le dataset et applique la politique étape par étape."""
         risk_mgr = RiskManager(capital=self.equity)
+        # Colonne extraite une seule fois : chaque pas ne manipule qu'une vue NumPy
+        closes = self.ohlc["close"].to_numpy(dtype=np.float64)
         for i in range(self.WINDOW, len(self.ohlc)):
             window = self.ohlc.iloc[i - self.WINDOW : i]
-            regime = self._compute_regime(window)
+            regime = self._compute_regime(closes[i - self.WINDOW : i])
             decision: TradeDecision = self.policy.decide(
                 self.symbol,
                 window,
@@ -138,7 +138,7 @@ class BacktestEngine:
             if decision == "hold":
                 continue
 
-            price = self._last_price(window)
+            price = float(closes[i - 1])
             raw_size = float(risk_mgr.compute_size(window))
             size = self._signed_size(raw_size, decision)
 
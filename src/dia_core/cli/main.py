@@ -17,11 +17,13 @@ Utilisé par :
 Auteur : DYXIUM Invest / D.I.A. Core
 """
 
+import logging
 import sys
 
 from src.dia_core.controller.execution import ExecutionController
 
 MIN_ARGS_REQUIRED = 2  # 1 = script, 2 = script + mode
+LOG_FORMAT = "%(asctime)s %(levelname)s %(message)s"
 
 
 def main(mode: str) -> None:
@@ -53,5 +55,8 @@ if __name__ == "__main__":
         print("Exemples : live, dry_run, backtest")
         sys.exit(1)
 
+    # Les exécuteurs tracent ordres et HOLD en INFO : handler console configuré ici seulement
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
     mode_arg = sys.argv[1]
     main(mode_arg)
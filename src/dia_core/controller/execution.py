@@ -64,8 +64,5 @@ class ExecutionController:
                 shared=self.shared_state,
             )
 
-            orchestrator = Orchestrator(
-                config=self.config,
-                deps=deps,
-            )
-            orchestrator.run()
+            with Orchestrator(config=self.config, deps=deps) as orchestrator:
+                orchestrator.run()
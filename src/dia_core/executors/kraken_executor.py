@@ -15,37 +15,136 @@ Utilisé par :
 Auteur : DYXIUM Invest / D.I.A. Core
 """
 
+import logging
 import os
+import re
 import time
 import hashlib
+import threading
 import hmac
 import base64
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from urllib.parse import urlencode
 from src.dia_core.models.intent import OrderIntent
 
+logger = logging.getLogger(__name__)
 
-def sign(urlpath: str, data: dict[str, Any], secret: str) -> str:
+# Caractères que quote_plus laisse inchangés : aucun échappement nécessaire
+_URL_SAFE = re.compile(r"[A-Za-z0-9_.~-]*")
+
+
+class _KeyChannel:
+    """Canal privé d'une clé API : nonce partagé et sérialisation des requêtes."""
+
+    def __init__(self) -> None:
+        # RLock : _private_request le tient pendant tout l'envoi et appelle _next_nonce
+        self.lock = threading.RLock()
+        self.last_nonce = 0
+
+
+# Kraken impose un nonce croissant par clé API, quel que soit le nombre d'exécuteurs
+_KEY_CHANNELS: dict[str, _KeyChannel] = {}
+_KEY_CHANNELS_LOCK = threading.Lock()
+
+
+def _key_channel(api_key: str) -> _KeyChannel:
+    """
+    Renvoie le canal (verrou + dernier nonce) associé à une clé API, créé une seule fois.
+
+    Args:
+      api_key: str: clé API Kraken
+
+    Returns:
+      _KeyChannel: canal partagé par tous les exécuteurs utilisant cette clé
+    """
+    with _KEY_CHANNELS_LOCK:
+        channel = _KEY_CHANNELS.get(api_key)
+        if channel is None:
+            channel = _KEY_CHANNELS[api_key] = _KeyChannel()
+        return channel
+
+
+def _fast_urlencode(data: dict[str, Any]) -> str:
+    """
+    Urlencode spécialisé pour les payloads Kraken (clés/valeurs ASCII simples).
+
+    Produit le même résultat que `urlencode(data)` ; si une clé ou une valeur
+    demande un échappement, délègue à `urlencode`.
+
+    Args:
+      data: dict: paramètres POST
+
+    Returns:
+      str: corps urlencodé
+    """
+    parts = []
+    for key, value in data.items():
+        text = str(value)
+        if _URL_SAFE.fullmatch(text) is None or _URL_SAFE.fullmatch(key) is None:
+            return urlencode(data)
+        parts.append(f"{key}={text}")
+    return "&".join(parts)
+
+
+def sign_bytes(
+    urlpath: str | bytes,
+    data: dict[str, Any],
+    secret: str | hmac.HMAC,
+    postdata: str | None = None,
+) -> bytes:
+    """
+    Crée une signature HMAC-SHA512 encodée en base64, sous forme de bytes.
+
+    Les bytes peuvent être passés tels quels en valeur d'en-tête HTTP, sans
+    aller-retour `.decode()` / `.encode()`.
+
+    Args:
+      urlpath: str | bytes: endpoint (éventuellement déjà encodé)
+      data: dict: paramètres POST
+      secret: str | hmac.HMAC: clé secrète base64, ou gabarit HMAC déjà initialisé
+        avec la clé décodée (évite le décodage et la préparation de clé à chaque appel)
+      postdata: str | None: corps déjà urlencodé de `data` (recalculé si absent)
+
+    Returns:
+      bytes: Signature encodée
+    """
+    if postdata is None:
+        postdata = urlencode(data)
+    path = urlpath if isinstance(urlpath, bytes) else urlpath.encode()
+    encoded = (str(data["nonce"]) + postdata).encode()
+    if isinstance(secret, str):
+        mac = hmac.new(base64.b64decode(secret), digestmod=hashlib.sha512)
+    else:
+        mac = secret.copy()
+    # Message = chemin + SHA256(nonce + postdata), absorbé sans concaténation
+    mac.update(path)
+    mac.update(hashlib.sha256(encoded).digest())
+    return base64.b64encode(mac.digest())
+
+
+def sign(
+    urlpath: str | bytes,
+    data: dict[str, Any],
+    secret: str | hmac.HMAC,
+    postdata: str | None = None,
+) -> str:
     """
     Crée une signature HMAC-SHA512 pour sécuriser l'appel API.
 
     Args:
-      urlpath: str: endpoint
+      urlpath: str | bytes: endpoint (éventuellement déjà encodé)
       data: dict: paramètres POST
-      secret: str: clé secrète
+      secret: str | hmac.HMAC: clé secrète base64 ou gabarit HMAC (voir `sign_bytes`)
+      postdata: str | None: corps déjà urlencodé de `data` (recalculé si absent)
 
     Returns:
       str: Signature encodée
     """
-    postdata = urlencode(data)
-    encoded = (str(data["nonce"]) + postdata).encode()
-    message = urlpath.encode() + hashlib.sha256(encoded).digest()
-    mac = hmac.new(base64.b64decode(secret), message, hashlib.sha512)
-    sigdigest = base64.b64encode(mac.digest())
-    return sigdigest.decode()
+    return sign_bytes(urlpath, data, secret, postdata).decode()
 
 
 class KrakenExecutor:
@@ -57,15 +156,51 @@ class KrakenExecutor:
             KRAKEN_API_KEY
             KRAKEN_API_SECRET
         """
-        self.api_key = str(os.environ.get("KRAKEN_API_KEY"))
-        self.api_secret = str(os.environ.get("KRAKEN_API_SECRET"))
+        api_key = os.environ.get("KRAKEN_API_KEY")
+        api_secret = os.environ.get("KRAKEN_API_SECRET")
 
-        if not self.api_key or not self.api_secret:
+        # Échec immédiat : une clé absente ne doit pas devenir la chaîne "None"
+        if not api_key or not api_secret:
             raise RuntimeError("Clés API Kraken manquantes (KRAKEN_API_KEY / SECRET)")
 
+        self.api_key = api_key
+        self.api_secret = api_secret
+
         self.url = "https://api.kraken.com"
         self.api_version = "0"
         self.session = requests.Session()
+        # Connexion keep-alive réutilisée : la poignée de main TLS n'est payée qu'une fois.
+        # Les requêtes privées d'une clé sont sérialisées (_KeyChannel) : une connexion suffit
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        # Gabarit HMAC : clé décodée et états ipad/opad calculés une seule fois
+        self._hmac_template = hmac.new(base64.b64decode(self.api_secret), digestmod=hashlib.sha512)
+        # Caches : méthode → (chemin, chemin encodé) et symbole → paire Kraken
+        self._urlpaths: dict[str, tuple[str, bytes]] = {}
+        self._pair_cache: dict[str, str] = {}
+        # Nonce strictement croissant par clé, même entre plusieurs exécuteurs (un par symbole)
+        self._channel = _key_channel(self.api_key)
+        # En-têtes constants des requêtes privées ; seul API-Sign varie par appel
+        self._base_headers: dict[str, str | bytes] = {
+            "Content-Type": "application/x-www-form-urlencoded; charset=utf-8",
+            "API-Key": self.api_key,
+        }
+
+    def close(self) -> None:
+        """Ferme la session HTTP (connexions keep-alive)."""
+        self.session.close()
+
+    def _next_nonce(self) -> int:
+        """
+        Génère le prochain nonce (ms epoch), unique et croissant pour la clé API.
+
+        Returns:
+          int: nonce à transmettre à Kraken
+        """
+        channel = self._channel
+        with channel.lock:
+            nonce = max(time.time_ns() // 1_000_000, channel.last_nonce + 1)
+            channel.last_nonce = nonce
+            return nonce
 
     def _private_request(self, method: str, data: dict[str, Any]) -> dict[str, Any]:
         """
@@ -78,16 +213,23 @@ class KrakenExecutor:
         Returns:
           dict: réponse JSON
         """
-        urlpath = f"/{self.api_version}/private/{method}"
+        paths = self._urlpaths.get(method)
+        if paths is None:
+            urlpath = f"/{self.api_version}/private/{method}"
+            paths = self._urlpaths[method] = (urlpath, urlpath.encode())
+        urlpath, urlpath_bytes = paths
         url = self.url + urlpath
 
-        data["nonce"] = int(1000 * time.time())
-        headers = {
-            "API-Key": self.api_key,
-            "API-Sign": sign(urlpath, data, self.api_secret),
-        }
+        # Verrou limité au nonce, à la signature et à l'envoi : les nonces d'une clé arrivent
+        # chez Kraken dans l'ordre. Le timeout lève requests.Timeout, le verrou est alors relâché
+        with self._channel.lock:
+            data["nonce"] = self._next_nonce()
+            postdata = _fast_urlencode(data)
+            headers = self._base_headers | {
+                "API-Sign": sign_bytes(urlpath_bytes, data, self._hmac_template, postdata)
+            }
 
-        response = self.session.post(url, headers=headers, data=data)
+            response = self.session.post(url, headers=headers, data=postdata.encode(), timeout=5)
         result = response.json()
 
         if result.get("error"):
@@ -110,10 +252,12 @@ class KrakenExecutor:
           None
         """
         if intent.action == "hold":
-            print(f"[KrakenExecutor] HOLD → aucun ordre envoyé pour {symbol}")
+            logger.info("[KrakenExecutor] HOLD → aucun ordre envoyé pour %s", symbol)
             return
 
-        kraken_pair = symbol.replace("/", "").upper()  # "BTC/EUR" → "XBTEUR"
+        kraken_pair = self._pair_cache.get(symbol)
+        if kraken_pair is None:  # "BTC/EUR" → "BTCEUR", calculé une fois par symbole
+            kraken_pair = self._pair_cache[symbol] = symbol.replace("/", "").upper()
         data = {
             "pair": kraken_pair,
             "type": intent.action,
@@ -121,6 +265,7 @@ class KrakenExecutor:
             "volume": str(intent.size),
         }
 
-        print(f"[KrakenExecutor] {symbol} → {intent.action.upper()} x {intent.size}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[KrakenExecutor] %s → %s x %s", symbol, intent.action.upper(), intent.size)
         result = self._private_request("AddOrder", data)
-        print(f"[Kraken] Order envoyé ✅ ID = {result.get('txid')}")
+        logger.info("[Kraken] Order envoyé ✅ ID = %s", result.get("txid"))
@@ -15,8 +15,12 @@ Utilisé par :
 Auteur : DYXIUM Invest / D.I.A. Core
 """
 
+import logging
+
 from src.dia_core.models.intent import OrderIntent
 
+logger = logging.getLogger(__name__)
+
 
 class MockExecutor:
     """Exécuteur simulé (dry_run) pour valider la logique du bot."""
@@ -39,4 +43,5 @@ class MockExecutor:
           None
         """
         self.last_order = intent
-        print(f"[MockExecutor] {symbol} → {intent.action.upper()} @ {intent.size}")
+        if logger.isEnabledFor(logging.INFO):  # évite upper() et le formatage si filtré
+            logger.info("[MockExecutor] %s → %s @ %s", symbol, intent.action.upper(), intent.size)
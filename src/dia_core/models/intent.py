@@ -21,7 +21,7 @@ from typing import Literal, Any
 Action = Literal["buy", "sell", "hold"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OrderIntent:
     """Représente une intention de trade standardisée."""
 
@@ -74,6 +74,11 @@ class OrderIntent:
 
     @classmethod
     def hold(cls, symbol: str | None = None, meta: dict[str, Any] | None = None) -> "OrderIntent":
+        # Cas le plus fréquent (aucun contexte) : instance partagée, pas d'allocation.
+        # Son `meta` ne doit pas être modifié : pour dériver une intention via
+        # dataclasses.replace(), passer un nouveau dict (ex : meta={...})
+        if symbol is None and meta is None and cls is OrderIntent:
+            return _HOLD
         return cls(action="hold", size=0.0, symbol=symbol, price=0.0, meta=meta or {})
 
     @classmethod
@@ -82,14 +87,31 @@ class OrderIntent:
         Conversion pratique depuis une prédiction IA.
         Args:
           prediction: -1, 0, 1 ou "sell"/"hold"/"buy"
+
+        Pour OrderIntent, les intentions renvoyées sont partagées : figées, et leur
+        `meta` (dict vide commun) ne doit pas être modifié. Un `replace()` qui
+        doit enrichir `meta` passe un nouveau dict.
         """
-        mapping: dict[int | str, OrderIntent] = {
-            -1: cls.short(0.01),
-            0: cls.hold(),
-            1: cls.long(0.01),
-            "sell": cls.short(0.01),
-            "hold": cls.hold(),
-            "buy": cls.long(0.01),
-        }
-        result: OrderIntent = mapping.get(prediction, cls.hold())
-        return result
+        if cls is OrderIntent:
+            return _PREDICTION_TABLE.get(prediction, _HOLD)
+        if prediction in (-1, "sell"):
+            return cls.short(0.01)
+        if prediction in (1, "buy"):
+            return cls.long(0.01)
+        return cls.hold()
+
+
+# Intention "hold" sans contexte, partagée par hold() et from_prediction()
+_HOLD = OrderIntent(action="hold", size=0.0, price=0.0)
+_SELL = OrderIntent(action="sell", size=0.01)
+_BUY = OrderIntent(action="buy", size=0.01)
+
+# Table construite une seule fois (instances immuables partagées)
+_PREDICTION_TABLE: dict[int | str, OrderIntent] = {
+    -1: _SELL,
+    0: _HOLD,
+    1: _BUY,
+    "sell": _SELL,
+    "hold": _HOLD,
+    "buy": _BUY,
+}
@@ -15,6 +15,19 @@ Utilisé par :
 Auteur : DYXIUM Invest / D.I.A. Core
 """
 
+from typing import Final
+
+# Univers statique de paires, par ordre de priorité
+UNIVERSE: Final[tuple[str, ...]] = (
+    "BTC/EUR",
+    "ETH/EUR",
+    "SOL/EUR",
+    "ADA/EUR",
+    "XRP/EUR",
+    "LINK/EUR",
+    "DOGE/EUR",
+)
+
 
 class MarketScanner:
     """Sélectionneur de symboles à surveiller/trader."""
@@ -39,13 +52,4 @@ class MarketScanner:
         Returns :
           List[str] : Liste de paires ex : ["BTC/EUR", "ETH/EUR"]
         """
-        universe = [
-            "BTC/EUR",
-            "ETH/EUR",
-            "SOL/EUR",
-            "ADA/EUR",
-            "XRP/EUR",
-            "LINK/EUR",
-            "DOGE/EUR",
-        ]
-        return universe[: self.limit]
+        return list(UNIVERSE[: self.limit])
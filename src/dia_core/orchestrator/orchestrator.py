@@ -15,7 +15,10 @@ Utilisé par :
 Auteur : DYXIUM Invest / D.I.A. Core
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Final
 
 from src.dia_core.config.models import BotConfig
 from src.dia_core.bot.shared import SharedState
@@ -23,6 +26,9 @@ from src.dia_core.strategy.decision_policy import DecisionPolicy
 from src.dia_core.orchestrator.resource_manager import ResourceManager
 from src.dia_core.orchestrator.market_scanner import MarketScanner
 
+# Nombre maximal de symboles traités en parallèle (ticks dominés par les I/O réseau)
+MAX_WORKERS: Final[int] = 8
+
 
 @dataclass
 class OrchestratorDeps:
@@ -60,36 +66,121 @@ class Orchestrator:
         self.scanner = MarketScanner()  # Composant IA de sélection des symboles
         self.resources = ResourceManager()  # Gestionnaire des ressources système / capital
 
-    def run(self) -> None:
+        # Composants par symbole (provider, executor, engine), créés au premier tick
+        # puis réutilisés : sessions HTTP et état des moteurs survivent entre cycles
+        self._components: dict[str, tuple[Any, Any, Any]] = {}
+
+        # Pool de threads créé une fois pour toute la durée de vie de l'orchestrateur
+        # (les threads ne sont lancés qu'à la demande), fermé par close()
+        self._pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="dia-tick")
+
+    def __enter__(self) -> "Orchestrator":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
         """
-        Exécute un cycle complet d'orchestration.
+        Arrête le pool de threads après la fin des ticks en cours, puis ferme
+        les composants en cache (sessions HTTP des providers et exécuteurs).
 
         Returns :
           None
         """
-        # 1. Récupération des symboles éligibles (scanner dynamique ou statique)
-        universe = self.scanner.get_symbols()
+        self._pool.shutdown(wait=True)
+        for symbol in list(self._components):
+            self._release(symbol)
 
-        # 2. Boucle principale : évalue chaque symbole indépendamment
-        for symbol in universe:
+    def _release(self, symbol: str) -> None:
+        """
+        Retire un symbole du cache et ferme ceux de ses composants qui exposent close().
 
-            # 3. Vérifie si les ressources disponibles permettent de traiter ce symbole
-            if not self.resources.can_run(symbol, self.shared):
-                continue  # Trop de charge ou drawdown → on saute
+        Args :
+          symbol : str :
+            Le symbole concerné
 
-            # 4. Crée un provider de données pour ce symbole
-            provider = self.provider_cls(symbol)
+        Returns :
+          None
+        """
+        for component in self._components.pop(symbol):
+            close = getattr(component, "close", None)
+            if callable(close):
+                close()
 
-            # 5. Crée un exécuteur adapté au mode (dry_run, réel)
-            executor = self.executor_cls()
+    def _get_components(self, symbol: str) -> tuple[Any, Any, Any]:
+        """
+        Renvoie le trio (provider, executor, engine) d'un symbole, créé une seule fois.
 
-            # 6. Initialise un moteur de décision/trading pour ce symbole
-            engine = self.engine_cls(
-                symbol=symbol,
-                config=self.config,
-                policy=self.policy,
-                shared=self.shared,
+        Chaque symbole n'est traité que par un seul thread à la fois : le cache
+        n'a pas besoin de verrou.
+
+        Args :
+          symbol : str :
+            Le symbole concerné
+
+        Returns :
+          tuple : (provider, executor, engine)
+        """
+        components = self._components.get(symbol)
+        if components is None:
+            # Provider de données, exécuteur adapté au mode, moteur de décision/trading
+            components = self._components[symbol] = (
+                self.provider_cls(symbol),
+                self.executor_cls(),
+                self.engine_cls(
+                    symbol=symbol,
+                    config=self.config,
+                    policy=self.policy,
+                    shared=self.shared,
+                ),
             )
+        return components
+
+    def _tick_one(self, symbol: str) -> None:
+        """
+        Exécute un tick de trading pour un symbole.
+
+        Args :
+          symbol : str :
+            Le symbole à traiter (ex : "BTC/EUR")
+
+        Returns :
+          None
+        """
+        # 3. Vérifie si les ressources disponibles permettent de traiter ce symbole
+        if not self.resources.can_run(symbol, self.shared):
+            return  # Trop de charge ou drawdown → on saute
+
+        # 4-6. Récupère (ou crée au premier passage) provider, exécuteur et moteur
+        provider, executor, engine = self._get_components(symbol)
+
+        # 7. Exécute un tick de trading pour ce symbole
+        engine.run_one_tick(provider, executor)
+
+    def run(self) -> None:
+        """
+        Exécute un cycle complet d'orchestration.
+
+        Les symboles sont indépendants (SharedState est protégé par un verrou) :
+        leurs ticks, limités par le réseau, sont exécutés en parallèle. La durée
+        d'un cycle est celle du tick le plus lent plutôt que leur somme.
+
+        Returns :
+          None
+        """
+        # 1. Récupération des symboles éligibles (scanner dynamique ou statique)
+        universe = self.scanner.get_symbols()
+
+        # Les symboles sortis de l'univers (ex : limit réduit) libèrent leurs composants
+        for symbol in self._components.keys() - set(universe):
+            self._release(symbol)
 
-            # 7. Exécute un tick de trading pour ce symbole
-            engine.run_one_tick(provider, executor)
+        # 2. Chaque symbole est évalué indépendamment, en parallèle ; list() attend
+        #    tous les ticks et relaie la première exception rencontrée
+        list(self._pool.map(self._tick_one, universe))
@@ -15,30 +15,57 @@ Utilisé par :
 Auteur : DYXIUM Invest / D.I.A. Core
 """
 
+from functools import lru_cache
+from urllib.parse import urlencode
+
+import numpy as np
 import requests
 import pandas as pd
-from typing import Literal
-
-
-def compute_regime(ohlc: pd.DataFrame) -> dict[str, float]:
+from requests.adapters import HTTPAdapter
+from typing import Final, Literal
+
+# Schéma typé d'une ligne OHLC Kraken : une seule passe de parsing, sans astype
+_KRAKEN_DTYPE: Final[np.dtype] = np.dtype(
+    [
+        ("time", "i8"),
+        ("open", "f8"),
+        ("high", "f8"),
+        ("low", "f8"),
+        ("close", "f8"),
+        ("vwap", "f8"),
+        ("volume", "f8"),
+        ("count", "i8"),
+    ]
+)
+_OHLC_COLUMNS: Final[tuple[str, ...]] = ("open", "high", "low", "close", "volume")
+
+HTTP_NOT_MODIFIED: Final[int] = 304
+
+
+def _build_session() -> requests.Session:
+    """Crée la session HTTP publique d'un provider (keep-alive, gzip)."""
+    session = requests.Session()
+    session.headers.update({"User-Agent": "DIA-Core/kraken", "Accept-Encoding": "gzip"})
+    # Un provider interroge un seul hôte depuis un seul thread : une connexion suffit
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+    return session
+
+
+@lru_cache(maxsize=256)
+def _ohlc_url(endpoint: str, pair: str, timeframe: str) -> str:
     """
-    Calcule un vecteur de régime simplifié depuis OHLC.
+    Construit l'URL OHLC complète (query string encodée) une fois par couple paire/résolution.
 
     Args:
-      ohlc: pd.DataFrame:
+      endpoint: str: URL de l'endpoint OHLC
+      pair: str: paire Kraken (ex: "BTCEUR")
+      timeframe: str: résolution ("1m", "5m", "15m")
 
     Returns:
-      dict: avec les clés : momentum, trend, volatility
+      str: URL prête à l'emploi, sans passe d'encodage `params=` par requête
     """
-    momentum = (ohlc["close"].iloc[-1] - ohlc["close"].iloc[-5]) / ohlc["close"].iloc[-5]
-    volatility = ohlc["close"].pct_change().rolling(5).std().iloc[-1]
-    trend = ohlc["close"].rolling(10).mean().iloc[-1] - ohlc["close"].mean()
-
-    return {
-        "momentum": float(momentum),
-        "volatility": float(volatility),
-        "trend": float(trend),
-    }
+    interval = int(timeframe.replace("m", ""))
+    return f"{endpoint}?{urlencode({'pair': pair, 'interval': interval})}"
 
 
 class KrakenProvider:
@@ -54,6 +81,14 @@ class KrakenProvider:
         """
         self.symbol = symbol.upper().replace("/", "")
         self.endpoint = "https://api.kraken.com/0/public/OHLC"
+        # Session propre au provider (un par symbole) : keep-alive sans partage entre threads
+        self.session = _build_session()
+        # Dernière réponse par URL : (ETag, DataFrame) pour les requêtes conditionnelles
+        self._etag_cache: dict[str, tuple[str, pd.DataFrame]] = {}
+
+    def close(self) -> None:
+        """Ferme la session HTTP (connexions keep-alive)."""
+        self.session.close()
 
     def get_ohlc(self, symbol: str, timeframe: Literal["1m", "5m", "15m"] = "5m") -> pd.DataFrame:
         """
@@ -66,29 +101,33 @@ class KrakenProvider:
             Résolution (Kraken : 1, 5, 15, 60...)
 
         Returns:
-          pd.DataFrame: Colonnes standard : open, high, low, close, volume
+          pd.DataFrame: Colonnes standard : open, high, low, close, volume.
+            Si Kraken répond 304 (ETag inchangé), la DataFrame en cache est
+            renvoyée telle quelle : l'appelant ne doit pas la modifier.
         """
         _ = symbol
-        params = {
-            "pair": self.symbol,
-            "interval": str(int(timeframe.replace("m", ""))),  # converti en str explicitement
-        }
+        url = _ohlc_url(self.endpoint, self.symbol, timeframe)
+
+        headers: dict[str, str] = {}
+        cached = self._etag_cache.get(url)
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
 
-        response = requests.get(self.endpoint, params=params, timeout=5)
+        response = self.session.get(url, headers=headers, timeout=5)
+        if cached is not None and response.status_code == HTTP_NOT_MODIFIED:
+            return cached[1]  # Pas de nouvelle bougie : ni parsing JSON ni conversion
         data = response.json()
 
         if not data.get("result"):
             raise RuntimeError(f"Erreur API Kraken : {data}")
 
         result = next(v for k, v in data["result"].items() if k != "last")
-        df = pd.DataFrame(
-            result, columns=["time", "open", "high", "low", "close", "vwap", "volume", "count"]
-        )
-        df["time"] = pd.to_datetime(df["time"], unit="s")
-        df.set_index("time", inplace=True)
+        rows = np.fromiter((tuple(r) for r in result), dtype=_KRAKEN_DTYPE, count=len(result))
+        index = pd.DatetimeIndex(pd.to_datetime(rows["time"], unit="s"), name="time")
 
-        df = df.astype(
-            {"open": float, "high": float, "low": float, "close": float, "volume": float}
-        )
+        df = pd.DataFrame({c: rows[c] for c in _OHLC_COLUMNS}, index=index)
 
-        return df[["open", "high", "low", "close", "volume"]]
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etag_cache[url] = (etag, df)
+        return df
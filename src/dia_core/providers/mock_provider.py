@@ -20,8 +20,15 @@ import pandas as pd
 from datetime import datetime, timedelta, UTC
 from typing import Literal
 
+# Active la génération des colonnes prix/volume en float32 (moitié moins de
+# bande passante mémoire). Les stratégies qui exigent du float64 passent
+# `float32=False` explicitement à `get_ohlc`.
+FLOAT32_OHLC: bool = False
 
-def get_ohlc(symbol: str, timeframe: Literal["5m", "1h"] = "5m") -> pd.DataFrame:
+
+def get_ohlc(
+    symbol: str, timeframe: Literal["5m", "1h"] = "5m", float32: bool | None = None
+) -> pd.DataFrame:
     """
     Retourne une DataFrame OHLC simulée.
 
@@ -30,53 +37,34 @@ def get_ohlc(symbol: str, timeframe: Literal["5m", "1h"] = "5m") -> pd.DataFrame
         Le symbole demandé
       timeframe: str:
         Résolution des données ("5m" ou "1h")
+      float32: bool | None:
+        Force (ou désactive) les colonnes float32 ; None = FLOAT32_OHLC
 
     Returns:
       pd.DataFrame: Données OHLC récentes
     """
     _ = symbol
     now = datetime.now(tz=UTC)
+    use_f32 = FLOAT32_OHLC if float32 is None else float32
+    dtype = np.float32 if use_f32 else np.float64
 
     period = 60 if timeframe == "1h" else 5
     index = [now - timedelta(minutes=i * period) for i in reversed(range(100))]
 
     prices = np.cumsum(np.random.randn(100)) + 100
-    data = pd.DataFrame(
-        {
-            "open": prices + np.random.randn(100) * 0.2,
-            "high": prices + np.random.rand(100) * 0.5,
-            "low": prices - np.random.rand(100) * 0.5,
-            "close": prices,
-            "volume": np.random.randint(100, 1000, size=100),
-        },
-        index=index,
-    )
+    volume = np.random.randint(100, 1000, size=100)
+    columns = {
+        "open": (prices + np.random.randn(100) * 0.2).astype(dtype, copy=False),
+        "high": (prices + np.random.rand(100) * 0.5).astype(dtype, copy=False),
+        "low": (prices - np.random.rand(100) * 0.5).astype(dtype, copy=False),
+        "close": prices.astype(dtype, copy=False),
+        "volume": volume.astype(np.float32) if use_f32 else volume,
+    }
+    data = pd.DataFrame(columns, index=index, copy=False)
 
     return data
 
 
-def compute_regime(ohlc: pd.DataFrame) -> dict[str, float]:
-    """
-    Génère un vecteur de régime synthétique.
-
-    Args:
-      ohlc: pd.DataFrame:
-        Les données à analyser
-
-    Returns:
-      dict: vecteur R (ex: tendance, momentum, etc.)
-    """
-    momentum = (ohlc["close"].iloc[-1] - ohlc["close"].iloc[-5]) / ohlc["close"].iloc[-5]
-    volatility = ohlc["close"].pct_change().rolling(5).std().iloc[-1]
-    trend = ohlc["close"].rolling(10).mean().iloc[-1] - ohlc["close"].mean()
-
-    return {
-        "momentum": float(momentum),
-        "volatility": float(volatility),
-        "trend": float(trend),
-    }
-
-
 class MockProvider:
     """Provider simulé générant des données OHLC aléatoires."""
 
@@ -0,0 +1,77 @@
+# Copyright (c) 2025 Fabien Grolier - DYXIUM Invest / D.I.A. Core
+# All Rights Reserved - Usage without permission is prohibited
+
+"""
+Nom du module : providers/regime.py
+
+Description :
+Calcul du vecteur de régime simplifié (momentum, volatilité, tendance)
+utilisé par le backtest. Seules les dernières valeurs des fenêtres
+glissantes sont utilisées : elles sont calculées directement sur les
+tableaux NumPy, sans passer par `pandas.rolling`.
+
+Utilisé par :
+    - BacktestEngine
+
+Auteur : DYXIUM Invest / D.I.A. Core
+"""
+
+from typing import Final
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+MOMENTUM_LAG: Final[int] = 4  # close[-1] comparé à close[-5]
+VOL_WINDOW: Final[int] = 5  # écart-type des 5 derniers rendements
+TREND_WINDOW: Final[int] = 10  # moyenne mobile courte
+
+
+def compute_regime_arrays(close: NDArray[np.float64]) -> dict[str, float]:
+    """
+    Calcule le vecteur de régime depuis la colonne de clôture déjà extraite.
+
+    Permet à un appelant qui itère sur des fenêtres (backtest) d'extraire la
+    colonne une seule fois et de passer des vues `close[i - w : i]`.
+
+    Args:
+      close: NDArray[np.float64]:
+        Prix de clôture, du plus ancien au plus récent (au moins 5 valeurs)
+
+    Returns:
+      dict: avec les clés : momentum, trend, volatility (NaN si l'historique est trop court)
+    """
+    momentum = (close[-1] - close[-1 - MOMENTUM_LAG]) / close[-1 - MOMENTUM_LAG]
+
+    # Équivalent de pct_change().rolling(5).std().iloc[-1] sur les seuls points utiles
+    if close.size > VOL_WINDOW:
+        tail = close[-VOL_WINDOW - 1 :]
+        volatility = float((np.diff(tail) / tail[:-1]).std(ddof=1))
+    else:
+        volatility = float("nan")
+
+    # Équivalent de rolling(10).mean().iloc[-1] - mean()
+    if close.size >= TREND_WINDOW:
+        trend = float(close[-TREND_WINDOW:].mean() - close.mean())
+    else:
+        trend = float("nan")
+
+    return {
+        "momentum": float(momentum),
+        "volatility": volatility,
+        "trend": trend,
+    }
+
+
+def compute_regime(ohlc: pd.DataFrame) -> dict[str, float]:
+    """
+    Calcule un vecteur de régime simplifié depuis OHLC.
+
+    Args:
+      ohlc: pd.DataFrame:
+        Données OHLC (colonne "close" requise, au moins 5 lignes)
+
+    Returns:
+      dict: avec les clés : momentum, trend, volatility (voir `compute_regime_arrays`)
+    """
+    return compute_regime_arrays(ohlc["close"].to_numpy(dtype=np.float64))
@@ -15,12 +15,17 @@ Utilisé par :
 Auteur : DYXIUM Invest / D.I.A. Core
 """
 
+from typing import Final
+
+import numpy as np
 import pandas as pd
 
 
 class RiskManager:
     """Gestionnaire de risque simple basé sur capital et ATR."""
 
+    ATR_WINDOW: Final[int] = 14
+
     def __init__(self, capital: float, risk_per_trade: float = 0.01) -> None:
         """
         Initialise le manager.
@@ -45,11 +50,16 @@ class RiskManager:
         Returns:
           float: Taille de la position en unité base (ex: BTC)
         """
-        # Approximation via ATR-like
-        ohlc["range"] = ohlc["high"] - ohlc["low"]
-        avg_range = ohlc["range"].rolling(14).mean().iloc[-1]
+        # Approximation via ATR-like : moyenne des ranges sur les dernières bougies,
+        # calculée directement sur les tableaux NumPy (pas de colonne ajoutée à `ohlc`)
+        if len(ohlc) < self.ATR_WINDOW:
+            return 0.0
+        tail = ohlc.iloc[-self.ATR_WINDOW :]
+        high = tail["high"].to_numpy(dtype=np.float64)
+        low = tail["low"].to_numpy(dtype=np.float64)
+        avg_range = float((high - low).mean())
 
-        if avg_range == 0 or pd.isna(avg_range):
+        if avg_range == 0 or np.isnan(avg_range):
             return 0.0
 
         risk_amount = self.capital * self.risk_per_trade
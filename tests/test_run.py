@@ -1,13 +1,36 @@
+import base64
+import copy
+import dataclasses
+import hashlib
+import hmac
+from http import HTTPStatus
 import os
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import json
 from pathlib import Path
+from urllib.parse import urlencode
 
+import numpy as np
 import pandas as pd
 import pytest
+import requests
 
 from dia_core.risk.risk_manager import RiskManager
 from dia_core.tracking.trade_logger import TradeLogger, TradeLogEntry
 from dia_core.config.risk_config_loader import get_risk_limits_for, RiskLimits
+from dia_core.providers import mock_provider
+from dia_core.providers.kraken_provider import KrakenProvider
+from dia_core.providers.regime import compute_regime, compute_regime_arrays
+from dia_core.models.intent import OrderIntent
+from dia_core.backtest.backtest_engine import BacktestEngine
+from dia_core.bot.shared import SharedState
+from dia_core.config.models import BotConfig
+from dia_core.orchestrator.market_scanner import MarketScanner
+from dia_core.orchestrator.orchestrator import Orchestrator, OrchestratorDeps
+from dia_core.strategy.heuristic_policy import HeuristicPolicy
+from dia_core.executors.kraken_executor import KrakenExecutor, _fast_urlencode, sign
 
 DEFAULT_RISK = 0.01
 HIGH_RISK = 0.015
@@ -60,6 +83,13 @@ def test_risk_manager_handles_zero_range() -> None:
     assert size == 0.0
 
 
+def test_risk_manager_does_not_mutate_ohlc() -> None:
+    ohlc = pd.DataFrame({"high": [11.0] * 20, "low": [10.0] * 20})
+    size = RiskManager(capital=10_000, risk_per_trade=DEFAULT_RISK).compute_size(ohlc)
+    assert size == pytest.approx(100.0)
+    assert list(ohlc.columns) == ["high", "low"]
+
+
 # ==== TESTS TRADE LOGGER ==== #
 
 
@@ -74,3 +104,325 @@ def test_trade_logger_creates_log(tmp_path: Path) -> None:
         line = json.loads(f.readline())
     assert line["symbol"] == "BTC/EUR"
     assert line["meta"]["note"] == "test"
+
+
+# ==== TESTS MOCK PROVIDER ==== #
+
+
+def test_mock_ohlc_float32_opt_in() -> None:
+    df = mock_provider.get_ohlc("BTC/EUR", float32=True)
+    assert (df.dtypes == np.float32).all()
+    assert mock_provider.get_ohlc("BTC/EUR")["close"].dtype == np.float64
+
+
+# ==== TESTS KRAKEN PROVIDER ==== #
+
+KRAKEN_ROWS = [
+    [1_700_000_000 + 300 * i, "100.0", "101.5", "99.5", f"{100.5 + i}", "100.2", "3.25", 7]
+    for i in range(3)
+]
+
+
+class _StubResponse:
+    def __init__(self, status_code: int, etag: str | None = None) -> None:
+        self.status_code = status_code
+        self.headers = {"ETag": etag} if etag else {}
+
+    def json(self) -> dict[str, object]:
+        assert self.status_code == HTTPStatus.OK, "json() ne doit pas être appelé sur un 304"
+        return {"error": [], "result": {"XXBTZEUR": KRAKEN_ROWS, "last": 0}}
+
+
+class _StubSession:
+    def __init__(self, *responses: _StubResponse) -> None:
+        self.responses = list(responses)
+        self.sent_headers: list[dict[str, str]] = []
+
+    def get(self, url: str, headers: dict[str, str], timeout: float) -> _StubResponse:
+        self.sent_headers.append(headers)
+        return self.responses.pop(0)
+
+
+def test_kraken_provider_parses_string_rows() -> None:
+    provider = KrakenProvider("BTC/EUR")
+    provider.session = _StubSession(_StubResponse(HTTPStatus.OK))
+    df = provider.get_ohlc("BTC/EUR")
+    assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+    assert (df.dtypes == np.float64).all()
+    assert isinstance(df.index, pd.DatetimeIndex)
+    assert df.index.name == "time"
+    assert df.index[0] == pd.Timestamp(1_700_000_000, unit="s")
+    assert df["close"].tolist() == [100.5, 101.5, 102.5]
+
+
+def test_kraken_provider_reuses_frame_on_304() -> None:
+    provider = KrakenProvider("BTC/EUR")
+    session = _StubSession(
+        _StubResponse(HTTPStatus.OK, etag='"v1"'), _StubResponse(HTTPStatus.NOT_MODIFIED)
+    )
+    provider.session = session
+    first = provider.get_ohlc("BTC/EUR")
+    assert provider.get_ohlc("BTC/EUR") is first
+    assert session.sent_headers == [{}, {"If-None-Match": '"v1"'}]
+
+
+def test_kraken_provider_without_etag_caches_nothing() -> None:
+    provider = KrakenProvider("BTC/EUR")
+    session = _StubSession(_StubResponse(HTTPStatus.OK), _StubResponse(HTTPStatus.OK))
+    provider.session = session
+    first = provider.get_ohlc("BTC/EUR")
+    assert provider.get_ohlc("BTC/EUR") is not first
+    assert session.sent_headers == [{}, {}]
+    assert provider._etag_cache == {}
+
+
+# ==== TESTS REGIME ==== #
+
+
+def test_regime_matches_pandas_rolling() -> None:
+    close = pd.Series(100 + np.cumsum(np.random.default_rng(1).normal(0, 1, 50)))
+    expected = {
+        "momentum": (close.iloc[-1] - close.iloc[-5]) / close.iloc[-5],
+        "volatility": close.pct_change().rolling(5).std().iloc[-1],
+        "trend": close.rolling(10).mean().iloc[-1] - close.mean(),
+    }
+    regime = compute_regime(pd.DataFrame({"close": close}))
+    assert regime == pytest.approx(expected)
+
+
+def test_backtest_regime_on_window_views_matches_pandas() -> None:
+    ohlc = pd.DataFrame({"close": 100 + np.cumsum(np.random.default_rng(2).normal(0, 1, 80))})
+    closes = ohlc["close"].to_numpy(dtype=np.float64)
+    window = BacktestEngine.WINDOW
+    for i in (window, 55, len(ohlc)):
+        ref = ohlc["close"].iloc[i - window : i]
+        regime = BacktestEngine._compute_regime(closes[i - window : i])
+        assert regime.momentum == pytest.approx((ref.iloc[-1] - ref.iloc[-5]) / ref.iloc[-5])
+        assert regime.volatility == pytest.approx(ref.pct_change().rolling(5).std().iloc[-1])
+        assert regime.trend == pytest.approx(ref.rolling(10).mean().iloc[-1] - ref.mean())
+
+
+def test_regime_short_history_gives_nan() -> None:
+    regime = compute_regime_arrays(np.array([100.0, 101.0, 102.0, 101.5, 103.0, 104.0]))
+    assert not np.isnan(regime["volatility"])
+    assert np.isnan(regime["trend"])
+    regime = compute_regime_arrays(np.array([100.0, 101.0, 102.0, 101.5, 103.0]))
+    assert np.isnan(regime["volatility"])
+    assert np.isnan(regime["trend"])
+
+
+# ==== TESTS ORDER INTENT ==== #
+
+
+def test_order_intent_shared_instances_are_frozen() -> None:
+    intent = OrderIntent.from_prediction("buy")
+    assert intent == OrderIntent.buy(0.01)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        intent.size = 1.0
+
+
+def test_order_intent_hold_is_shared_without_context() -> None:
+    assert OrderIntent.hold() is OrderIntent.hold() is OrderIntent.from_prediction(0)
+    assert OrderIntent.hold(symbol="BTC/EUR").symbol == "BTC/EUR"
+
+
+def test_order_intent_replace_gets_fresh_meta() -> None:
+    derived = dataclasses.replace(OrderIntent.hold(), symbol="BTC/EUR", meta={"reason": "x"})
+    derived.meta["note"] = "ok"
+    assert OrderIntent.hold().meta == {}
+
+
+def test_order_intent_from_prediction_keeps_subclass() -> None:
+    # OrderIntent est vu comme Any par mypy (import via dia_core, pythonpath de pytest)
+    class TaggedIntent(OrderIntent):  # type: ignore[misc]
+        __slots__ = ()
+
+    for prediction, action in ((-1, "sell"), (0, "hold"), ("buy", "buy"), ("?", "hold")):
+        intent = TaggedIntent.from_prediction(prediction)
+        assert type(intent) is TaggedIntent
+        assert intent.action == action
+
+
+def test_order_intent_hold_meta_defaults_to_empty() -> None:
+    assert OrderIntent.hold().meta == {}
+    assert OrderIntent.hold(meta={"reason": "x"}).meta == {"reason": "x"}
+
+
+@pytest.mark.parametrize("intent", [OrderIntent.hold(), OrderIntent.from_prediction(1)])
+def test_order_intent_shared_instances_serialize(intent: OrderIntent) -> None:
+    assert dataclasses.asdict(intent)["meta"] == {}
+    assert copy.deepcopy(intent) == intent
+    assert pickle.loads(pickle.dumps(intent)) == intent  # noqa: S301
+    assert json.loads(json.dumps(intent.meta)) == {}
+
+
+# ==== TESTS ORCHESTRATOR ==== #
+
+
+def test_orchestrator_ticks_symbols_concurrently_with_cached_components() -> None:
+    ticked: list[str] = []
+    symbols = MarketScanner().get_symbols()
+    # Chaque tick attend tous les autres : ne passe que si les ticks se chevauchent
+    barrier = threading.Barrier(len(symbols), timeout=5)
+
+    class _Engine:
+        def __init__(self, symbol: str, **_: object) -> None:
+            self.symbol = symbol
+
+        def run_one_tick(self, provider: object, executor: object) -> None:
+            barrier.wait()
+            ticked.append(self.symbol)
+
+    deps = OrchestratorDeps(
+        engine_cls=_Engine,
+        provider_cls=str,
+        executor_cls=object,
+        policy=HeuristicPolicy(),
+        shared=SharedState(global_equity=1000.0),
+    )
+    with Orchestrator(BotConfig(mode="dry_run"), deps) as orchestrator:
+        orchestrator.run()
+        assert sorted(ticked) == sorted(symbols)
+
+        engines = {symbol: c[2] for symbol, c in orchestrator._components.items()}
+        pool = orchestrator._pool
+        orchestrator.run()
+        assert all(orchestrator._components[s][2] is e for s, e in engines.items())
+        assert orchestrator._pool is pool
+
+
+def test_orchestrator_releases_dropped_and_closed_components() -> None:
+    closed: list[str] = []
+
+    class _Provider:
+        def __init__(self, symbol: str) -> None:
+            self.symbol = symbol
+
+        def close(self) -> None:
+            closed.append(self.symbol)
+
+    class _Engine:
+        def __init__(self, **_: object) -> None:
+            pass
+
+        def run_one_tick(self, provider: object, executor: object) -> None:
+            pass
+
+    deps = OrchestratorDeps(
+        engine_cls=_Engine,
+        provider_cls=_Provider,
+        executor_cls=object,
+        policy=HeuristicPolicy(),
+        shared=SharedState(global_equity=1000.0),
+    )
+    with Orchestrator(BotConfig(mode="dry_run"), deps) as orchestrator:
+        orchestrator.scanner.limit = 3
+        orchestrator.run()
+        orchestrator.scanner.limit = 2
+        orchestrator.run()
+        kept = orchestrator.scanner.get_symbols()
+        assert sorted(orchestrator._components) == sorted(kept)
+        assert closed == ["SOL/EUR"]
+    assert sorted(closed) == sorted(["SOL/EUR", *kept])
+    assert not orchestrator._components
+
+
+# ==== TESTS KRAKEN EXECUTOR ==== #
+
+SECRET_B64 = base64.b64encode(b"kraken-test-secret").decode()
+
+
+def test_kraken_sign_with_hmac_template_matches_secret() -> None:
+    data = {"nonce": 1_700_000_000_000, "pair": "BTCEUR", "type": "buy"}
+    template = hmac.new(base64.b64decode(SECRET_B64), digestmod=hashlib.sha512)
+    expected = sign("/0/private/AddOrder", data, SECRET_B64)
+    assert sign("/0/private/AddOrder", data, template) == expected
+    # Le gabarit n'est pas consommé : un second appel donne la même signature
+    assert sign("/0/private/AddOrder", data, template) == expected
+
+
+@pytest.fixture
+def kraken_executor(monkeypatch: pytest.MonkeyPatch) -> KrakenExecutor:
+    monkeypatch.setenv("KRAKEN_API_KEY", "test-key")
+    monkeypatch.setenv("KRAKEN_API_SECRET", SECRET_B64)
+    return KrakenExecutor()
+
+
+def test_kraken_nonce_strictly_increasing(kraken_executor: KrakenExecutor) -> None:
+    nonces = [kraken_executor._next_nonce() for _ in range(100)]
+    assert nonces == sorted(set(nonces))
+
+
+def test_kraken_nonce_shared_across_executors_of_same_key(
+    kraken_executor: KrakenExecutor,
+) -> None:
+    executors = [kraken_executor, KrakenExecutor()]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        nonces = list(pool.map(lambda i: executors[i % 2]._next_nonce(), range(400)))
+    assert len(set(nonces)) == len(nonces)
+
+
+def test_kraken_private_requests_reach_api_in_nonce_order(
+    kraken_executor: KrakenExecutor,
+) -> None:
+    sent: list[int] = []
+    sent_lock = threading.Lock()
+
+    class _Response:
+        def json(self) -> dict[str, object]:
+            return {"error": [], "result": {}}
+
+    def post(url: str, headers: dict[str, object], data: bytes, timeout: float) -> _Response:
+        with sent_lock:
+            sent.append(int(dict(p.split("=") for p in data.decode().split("&"))["nonce"]))
+        return _Response()
+
+    executors = [kraken_executor, KrakenExecutor()]
+    for executor in executors:
+        executor.session.post = post
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda i: executors[i % 2]._private_request("Balance", {}), range(200)))
+    assert sent == sorted(set(sent))
+
+
+def test_kraken_post_timeout_releases_key_lock(kraken_executor: KrakenExecutor) -> None:
+    timeouts: list[float] = []
+
+    def stalled_post(url: str, headers: dict[str, object], data: bytes, timeout: float) -> None:
+        timeouts.append(timeout)
+        raise requests.Timeout
+
+    kraken_executor.session.post = stalled_post
+    with pytest.raises(requests.Timeout):
+        kraken_executor._private_request("Balance", {})
+    assert timeouts == [5]
+
+    # Un autre thread (autre exécuteur, même clé) peut reprendre le verrou
+    lock = KrakenExecutor()._channel.lock
+
+    def acquire_and_release() -> bool:
+        acquired: bool = lock.acquire(timeout=1)
+        if acquired:
+            lock.release()
+        return acquired
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(acquire_and_release).result()
+
+
+def test_kraken_executor_requires_credentials(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("KRAKEN_API_KEY", raising=False)
+    monkeypatch.setenv("KRAKEN_API_SECRET", SECRET_B64)
+    with pytest.raises(RuntimeError):
+        KrakenExecutor()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"pair": "BTCEUR", "type": "buy", "ordertype": "market", "volume": "0.5", "nonce": 1},
+        {"pair": "BTC/EUR", "userref": "a b&c=d"},
+    ],
+)
+def test_kraken_fast_urlencode_matches_stdlib(data: dict[str, object]) -> None:
+    assert _fast_urlencode(data) == urlencode(data)